@@ -0,0 +1,155 @@
+import math
+from dataclasses import dataclass, field, fields
+
+# ---------------------------------------------------------
+# Gasse (eine Gasse = ein Gerät)
+# ---------------------------------------------------------
+@dataclass(frozen=True)
+class Gasse:
+    verfahrweg: float            # [m] Gassenlänge - Anfahrmaß
+    gassenhoehe: float           # [m]
+    geschw_vx: float             # [m/s]
+    beschl_ax: float             # [m/s²]
+    verschliff_x: float          # [s]
+    geschw_vy: float             # [m/s]
+    beschl_ay: float             # [m/s²]
+    verschliff_y: float          # [s]
+    vorzone_einlagern: float     # [s]
+    vorzone_auslagern: float     # [s]
+    platz1: float                # [s]
+    platz2: float                # [s]
+    verschliff_lam: float        # [s]
+    umlagerungen_anteil: float   # [%]
+    geraet: str = field(default="RBG 1 Mast", compare=False)  # geht nicht in die Rechnung ein
+
+    def __post_init__(self):
+        for f in fields(self):
+            if f.name == "geraet":
+                continue
+            wert = getattr(self, f.name)
+            if not math.isfinite(wert):
+                raise ValueError(f"{f.name}: Wert muss endlich sein")
+            if f.name in ("geschw_vx", "beschl_ax", "geschw_vy", "beschl_ay"):
+                if wert <= 0:
+                    raise ValueError(f"{f.name}: Wert muss größer 0 sein")
+            elif wert < 0:
+                raise ValueError(f"{f.name}: Wert darf nicht negativ sein")
+        if self.umlagerungen_anteil > 100:
+            raise ValueError("umlagerungen_anteil: Wert muss zwischen 0 und 100 liegen")
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Gasse":
+        werte = {}
+        for f in fields(cls):
+            if f.name == "geraet":
+                if f.name in data:
+                    werte[f.name] = str(data[f.name])
+                continue
+            if data.get(f.name) in (None, ""):
+                raise ValueError(f"{f.name}: Wert fehlt")
+            try:
+                werte[f.name] = float(data[f.name])
+            except (TypeError, ValueError):
+                raise ValueError(f"{f.name}: keine Zahl ({data[f.name]!r})") from None
+        return cls(**werte)
+
+    def to_dict(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+# ---------------------------------------------------------
+# Spielzeit nach FEM 9.851 (nur Fall 1: Übergabe an der Gassenstirn)
+# ---------------------------------------------------------
+def fahrzeit(s: float, v: float, a: float) -> float:
+    # Trapezprofil; wird v nicht erreicht -> Dreiecksprofil
+    if s <= 0:
+        return 0.0
+    if s >= v * v / a:
+        return s / v + v / a
+    return 2.0 * math.sqrt(s / a)
+
+def fahrzeit_punkt(g: Gasse, dx: float, dy: float) -> float:
+    # x und y fahren gleichzeitig, maßgebend ist die längere Achse
+    tx = fahrzeit(abs(dx), g.geschw_vx, g.beschl_ax) + (g.verschliff_x if dx else 0.0)
+    ty = fahrzeit(abs(dy), g.geschw_vy, g.beschl_ay) + (g.verschliff_y if dy else 0.0)
+    return max(tx, ty)
+
+def berechne_gasse(g: Gasse) -> dict:
+    L, H = g.verfahrweg, g.gassenhoehe
+    P1 = (L / 5, 2 * H / 3)
+    P2 = (2 * L / 3, H / 5)
+    t_p1 = fahrzeit_punkt(g, *P1)
+    t_p2 = fahrzeit_punkt(g, *P2)
+    t_p1p2 = fahrzeit_punkt(g, P2[0] - P1[0], P2[1] - P1[1])
+
+    # Lastaufnahmemittel: Umlagerungen greifen zusätzlich auf Platz 2 zu
+    anteil = g.umlagerungen_anteil / 100.0
+    t_vorzone = (g.vorzone_einlagern + g.vorzone_auslagern) / 2 + g.verschliff_lam
+    t_platz = g.platz1 + anteil * g.platz2 + g.verschliff_lam
+
+    t_es = t_p1 + t_p2 + t_vorzone + t_platz
+    t_ds = t_p1 + t_p2 + t_p1p2 + 2 * t_vorzone + 2 * t_platz
+    return {
+        "t_es": t_es,
+        "t_ds": t_ds,
+        "durchsatz_es": 3600.0 / t_es if t_es > 0 else 0.0,
+        "durchsatz_ds": 2 * 3600.0 / t_ds if t_ds > 0 else 0.0,
+    }
+
+# ---------------------------------------------------------
+# Lager (mehrere Gassen)
+# ---------------------------------------------------------
+class Lager:
+    def __init__(self, gassen: dict[str, Gasse] | None = None):
+        self.gassen: dict[str, Gasse] = dict(gassen or {})
+        self._cache: dict[Gasse, dict] = {}   # gleiche Konfiguration -> ein Ergebnis
+
+    def set_gasse(self, name: str, gasse: Gasse):
+        self.gassen[name] = gasse
+
+    def remove_gasse(self, name: str):
+        self.gassen.pop(name, None)
+
+    def rename_gasse(self, alt: str, neu: str):
+        # Reihenfolge der Gassen beibehalten
+        self.gassen = {neu if k == alt else k: g for k, g in self.gassen.items()}
+
+    def berechnen(self) -> dict[str, dict]:
+        # nur Konfigurationen rechnen, die noch nicht im Cache liegen
+        for g in set(self.gassen.values()):
+            if g not in self._cache:
+                self._cache[g] = berechne_gasse(g)
+
+        # nicht mehr verwendete Konfigurationen verwerfen
+        aktiv = set(self.gassen.values())
+        for g in [g for g in self._cache if g not in aktiv]:
+            del self._cache[g]
+
+        return {name: self._cache[g] for name, g in self.gassen.items()}
+
+    def kennzahlen(self) -> dict:
+        ergebnisse = self.berechnen()
+        n = len(ergebnisse)
+        if not n:
+            return {"anzahl_gassen": 0, "durchsatz_es": 0.0, "durchsatz_ds": 0.0,
+                    "t_es_mittel": 0.0, "t_ds_mittel": 0.0, "engpass": None}
+        return {
+            "anzahl_gassen": n,
+            "durchsatz_es": sum(r["durchsatz_es"] for r in ergebnisse.values()),
+            "durchsatz_ds": sum(r["durchsatz_ds"] for r in ergebnisse.values()),
+            "t_es_mittel": sum(r["t_es"] for r in ergebnisse.values()) / n,
+            "t_ds_mittel": sum(r["t_ds"] for r in ergebnisse.values()) / n,
+            "engpass": min(ergebnisse, key=lambda k: ergebnisse[k]["durchsatz_ds"]),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Lager":
+        gassen = {}
+        for name, g in data.get("gassen", {}).items():
+            try:
+                gassen[name] = Gasse.from_dict(g)
+            except ValueError as e:
+                raise ValueError(f"{name}: {e}") from None
+        return cls(gassen)
+
+    def to_dict(self) -> dict:
+        return {"gassen": {name: g.to_dict() for name, g in self.gassen.items()}}
@@ -6,9 +6,11 @@ from PySide6.QtGui import QPainter, QPen, QFont, QColor, QPixmap, QGuiApplicatio
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QFrame, QLabel, QPushButton,
     QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem, QComboBox,
-    QFileDialog, QMessageBox, QDialog, QDialogButtonBox, QStyleFactory, QLineEdit   # <-- neu
+    QFileDialog, QMessageBox, QDialog, QDialogButtonBox, QStyleFactory, QLineEdit, QInputDialog
 )
 
+from lagermodell import Gasse, Lager
+
 # ---------------------------------------------------------
 # Pfade / Ressourcen
 # ---------------------------------------------------------
@@ -318,7 +320,8 @@ class SettingsDialog(QDialog):
         QMessageBox.information(
             self, "User Manual",
             "Kurzanleitung\n\n"
-            "• Gerät & FEM-Fall wählen → „Berechnen“.\n"
+            "• Gasse wählen/anlegen, Werte eingeben → „Berechnen“.\n"
+            "• FEM 9.851: berechnet wird nur Fall 1 (Übergabe an der Gassenstirn).\n"
             "• Menü links: New/Open/Save/Export.\n"
             "• Settings: Theme-Umschaltung, Manual.\n"
         )
@@ -336,6 +339,10 @@ class MainWindow(QMainWindow):
         self.app = app
         self.config = load_config()
         self.current_theme = self.config.get("theme", "light")
+        self.lager = Lager()
+        self._gasse_name: str | None = None   # Gasse, die gerade in der Eingabemaske steht
+        self.projekt: dict = {}               # nummer/name/beschreibung aus der Projektdatei
+        self.projekt_pfad: Path | None = None
 
         self.setWindowTitle("Spielzeit – FEM 9.831 Tool")
         self.resize(1200, 740)
@@ -357,7 +364,12 @@ class MainWindow(QMainWindow):
         self.btn_export.clicked.connect(self.action_export)
         self.btn_settings.clicked.connect(self.action_settings)
         self.btn_calc.clicked.connect(self.action_calculate)
-        self.combo_case.currentIndexChanged.connect(lambda idx: self.case_view.set_case(idx + 1))
+        self.combo_case.currentIndexChanged.connect(lambda idx: self.canvas.set_case(idx + 1))
+        self.combo_gasse.currentTextChanged.connect(self._gasse_gewechselt)
+        self.btn_gasse_neu.clicked.connect(self.action_gasse_neu)
+        self.btn_gasse_umbenennen.clicked.connect(self.action_gasse_umbenennen)
+        self.btn_gasse_loeschen.clicked.connect(self.action_gasse_loeschen)
+        self._gassen_liste_aktualisieren()
 
         # nach Konstruktion: Paletten anwenden
         self.apply_runtime_palettes(self.current_theme)
@@ -413,6 +425,9 @@ class MainWindow(QMainWindow):
 
         self.combo_case   = QComboBox(); self.combo_case.setObjectName("CaseCombo")       # <-- wichtig
         self.combo_case.addItems([f"FEM 9.851 – Fall {i}" for i in range(1,7)]); self.combo_case.setFixedWidth(160)
+        for i in range(1, self.combo_case.count()):  # berechnet wird bisher nur Fall 1
+            item = self.combo_case.model().item(i)
+            item.setEnabled(False); item.setToolTip("Noch nicht implementiert")
 
         self.btn_calc     = QPushButton("Berechnen"); self.btn_calc.setObjectName("PrimaryButton")
 
@@ -429,6 +444,21 @@ class MainWindow(QMainWindow):
         input_form_layout.setHorizontalSpacing(12)
         input_form_layout.setVerticalSpacing(6)
         self.input_fields = {}
+
+        # -------- Gassenauswahl --------
+        self.combo_gasse = QComboBox(); self.combo_gasse.setObjectName("GasseCombo"); self.combo_gasse.setFixedWidth(140)
+        self.btn_gasse_neu        = QPushButton("+")
+        self.btn_gasse_umbenennen = QPushButton("✎")
+        self.btn_gasse_loeschen   = QPushButton("−")
+        gassen_row = QHBoxLayout(); gassen_row.setSpacing(6)
+        gassen_row.addWidget(self.combo_gasse)
+        for b, tip in ((self.btn_gasse_neu, "Gasse hinzufügen (übernimmt aktuelle Werte)"),
+                       (self.btn_gasse_umbenennen, "Gasse umbenennen"),
+                       (self.btn_gasse_loeschen, "Gasse entfernen")):
+            b.setFixedWidth(28); b.setToolTip(tip); gassen_row.addWidget(b)
+        gassen_row.addStretch(1)
+        input_form_layout.addRow(QLabel("Gasse:"), gassen_row)
+
         labels = [
             ("Verfahrw. (Gassenl.-Anfahrm.) [m]", "verfahrweg"),
             ("Gassenhöhe [m]", "gassenhoehe"),
@@ -480,8 +510,8 @@ class MainWindow(QMainWindow):
         self.performance_table_layout.setSpacing(0)
         self.leistungs_table = QTableWidget(3, 3)
         self.leistungs_table.setHorizontalHeaderLabels(["Kriterium", "Wert", "Einheit"])
-        self.leistungs_table.setVerticalHeaderLabels(["Leistung 1", "Leistung 2", "Leistung 3"])
-        self.leistungs_table.setFixedHeight(200)
+        self.leistungs_table.verticalHeader().setVisible(False)  # Spalte „Kriterium“ benennt die Zeilen
+        self.leistungs_table.setFixedHeight(230)
         beispiel_daten = [
             ("Durchsatz", "120", "Pal/h"),
             ("Fahrzeit", "35", "s"),
@@ -537,10 +567,11 @@ class MainWindow(QMainWindow):
         kpi_layout.addWidget(self.kpi_throughput)
         kpi_layout.addWidget(self.kpi_ratio)
         kpi_layout.addWidget(self.kpi_utilization)
-        kpi_wrapper = QFrame()
-        kpi_wrapper.setLayout(kpi_layout)
-        kpi_wrapper.setObjectName("KPIWrapper")
-        top_row_layout.addWidget(kpi_wrapper, stretch=2)
+        self.kpi_wrapper = QFrame()
+        self.kpi_wrapper.setLayout(kpi_layout)
+        self.kpi_wrapper.setObjectName("KPIWrapper")
+        self.kpi_wrapper.setVisible(False)  # nur Demo-Werte, bis es echte %-Kennzahlen gibt
+        top_row_layout.addWidget(self.kpi_wrapper, stretch=2)
 
         main_layout.addLayout(top_row_layout)
 
@@ -627,6 +658,8 @@ class MainWindow(QMainWindow):
             safe_name = f"{data['nummer']}_{data['name']}".replace("/", "_").replace(" ", "_")
             info_datei = projektordner / f"{safe_name}.json"
             info_datei.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            self.projekt, self.projekt_pfad = dict(data), info_datei
+            self._lager_setzen(Lager())
             QMessageBox.information(self, "Projekt erstellt", f"Projekt gespeichert:\n{info_datei}")
             self.topbar_title.setText(f"Spielzeitberechnung {data['nummer']} {data['name']}")
 
@@ -637,14 +670,23 @@ class MainWindow(QMainWindow):
                 data = json.loads(Path(path).read_text(encoding="utf-8"))
                 nummer = data.get("nummer", "Unbekannt")
                 name = data.get("name", "Unbenannt")
+                lager = Lager.from_dict(data)
+                self.projekt = {k: v for k, v in data.items() if k != "gassen"}
+                self.projekt_pfad = Path(path)
+                self._lager_setzen(lager)
                 self.topbar_title.setText(f"Spielzeitberechnung {nummer} {name}")
                 QMessageBox.information(self, "Projekt geöffnet", f"Projekt geladen:\n{path}")
             except Exception as e:
                 QMessageBox.critical(self, "Fehler", f"Fehler beim Laden:\n{e}")
     def action_save(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Projekt speichern", str(DATA_DIR / "projekt.json"), "Projektdateien (*.json)")
+        if not self._formular_uebernehmen():
+            return
+        start = self.projekt_pfad or DATA_DIR / "projekt.json"
+        path, _ = QFileDialog.getSaveFileName(self, "Projekt speichern", str(start), "Projektdateien (*.json)")
         if path:
-            Path(path).write_text(json.dumps({"demo": True}, indent=2), encoding="utf-8")
+            data = {**self.projekt, **self.lager.to_dict()}
+            Path(path).write_text(json.dumps(data, indent=2), encoding="utf-8")
+            self.projekt_pfad = Path(path)
             QMessageBox.information(self, "Gespeichert", f"Projekt gespeichert:\n{path}")
     def action_export(self):
         topbar_text = self.topbar_title.text().replace("Spielzeitberechnung", "").strip()
@@ -673,10 +715,141 @@ class MainWindow(QMainWindow):
         new_theme = "dark" if self.current_theme == "light" else "light"
         self.apply_theme(new_theme)
 
-    # Demo-Rechnung
+    # Berechnung: Eingabemaske = aktuelle Gasse, Kennzahlen über alle Gassen des Lagers
     def action_calculate(self):
-        # Calculation logic can be kept for future use, but progress indicators are removed.
-        pass
+        if not self._formular_uebernehmen():
+            return
+        if not self.lager.gassen:
+            QMessageBox.warning(self, "Fehler", "Bitte zuerst die Eingabefelder füllen.")
+            return
+        if self.combo_case.currentIndex() != 0:
+            QMessageBox.warning(self, "Fehler", "Berechnet wird bisher nur FEM 9.851 – Fall 1.")
+            return
+        self._show_kennzahlen(self.lager.kennzahlen())
+
+    def _show_kennzahlen(self, kpi: dict):
+        daten = [
+            ("Durchsatz DS", f"{kpi['durchsatz_ds']:.0f}", "Pal/h"),
+            ("Spielzeit DS (Mittel)", f"{kpi['t_ds_mittel']:.1f}", "s"),
+            ("Durchsatz ES", f"{kpi['durchsatz_es']:.0f}", "Pal/h"),
+            ("Spielzeit ES (Mittel)", f"{kpi['t_es_mittel']:.1f}", "s"),
+            ("Gassen", str(kpi["anzahl_gassen"]), ""),
+            ("Engpass (DS)", kpi["engpass"] or "–", ""),
+        ]
+        self.leistungs_table.setRowCount(len(daten))
+        for row, (kriterium, wert, einheit) in enumerate(daten):
+            self.leistungs_table.setItem(row, 0, QTableWidgetItem(kriterium))
+            self.leistungs_table.setItem(row, 1, QTableWidgetItem(wert))
+            self.leistungs_table.setItem(row, 2, QTableWidgetItem(einheit))
+
+    # ---- Gassen ----
+    def _gasse_aus_formular(self) -> Gasse:
+        werte = {k: le.text().strip().replace(",", ".") for k, le in self.input_fields.items()}
+        werte["geraet"] = self.combo_device.currentText()
+        return Gasse.from_dict(werte)
+
+    def _gasse_in_formular(self, gasse: Gasse):
+        for k, le in self.input_fields.items():
+            le.setText(repr(getattr(gasse, k)).removesuffix(".0"))  # verlustfrei, sonst ändert Speichern die Werte
+        self.combo_device.setCurrentText(gasse.geraet)
+
+    def _formular_leeren(self):
+        # ohne gewählte Gasse gilt jede Eingabe als neue Gasse -> alte Werte entfernen
+        for le in self.input_fields.values():
+            le.clear()
+
+    def _formular_uebernehmen(self) -> bool:
+        # Eingaben unter der gewählten Gasse ablegen; ohne Gasse wird eine neue angelegt
+        if self._gasse_name is None and not any(le.text().strip() for le in self.input_fields.values()):
+            return True
+        try:
+            gasse = self._gasse_aus_formular()
+        except ValueError as e:
+            QMessageBox.warning(self, "Fehler", f"Ungültige Eingabe:\n{e}")
+            return False
+        if self._gasse_name is None:
+            self._gasse_name = self._freier_gassenname()
+            self.lager.set_gasse(self._gasse_name, gasse)
+            self._gassen_liste_aktualisieren()
+        else:
+            self.lager.set_gasse(self._gasse_name, gasse)
+        return True
+
+    def _freier_gassenname(self) -> str:
+        i = len(self.lager.gassen) + 1
+        while f"Gasse {i}" in self.lager.gassen:
+            i += 1
+        return f"Gasse {i}"
+
+    def _gassen_liste_aktualisieren(self):
+        self.combo_gasse.blockSignals(True)
+        self.combo_gasse.clear()
+        self.combo_gasse.addItems(list(self.lager.gassen))
+        if self._gasse_name is not None:
+            self.combo_gasse.setCurrentText(self._gasse_name)
+        self.combo_gasse.blockSignals(False)
+        self.btn_gasse_umbenennen.setEnabled(self._gasse_name is not None)
+        self.btn_gasse_loeschen.setEnabled(self._gasse_name is not None)
+
+    def _lager_setzen(self, lager: Lager):
+        self.lager = lager
+        self._gasse_name = next(iter(lager.gassen), None)
+        self._gassen_liste_aktualisieren()
+        if self._gasse_name is not None:
+            self._gasse_in_formular(lager.gassen[self._gasse_name])
+        else:
+            self._formular_leeren()
+
+    def _gasse_gewechselt(self, name: str):
+        if not name or name == self._gasse_name:
+            return
+        if not self._formular_uebernehmen():
+            self._gassen_liste_aktualisieren()  # zurück zur bisherigen Gasse
+            return
+        self._gasse_name = name
+        self._gasse_in_formular(self.lager.gassen[name])
+
+    def action_gasse_neu(self):
+        # neue Gasse übernimmt die aktuellen Eingaben als Vorlage
+        war_leer = self._gasse_name is None
+        if not self._formular_uebernehmen():
+            return
+        if self._gasse_name is None:
+            QMessageBox.warning(self, "Fehler", "Bitte zuerst die Eingabefelder füllen.")
+            return
+        if war_leer:
+            return  # Eingaben wurden eben als erste Gasse angelegt
+        name = self._freier_gassenname()
+        self.lager.set_gasse(name, self.lager.gassen[self._gasse_name])
+        self._gasse_name = name
+        self._gassen_liste_aktualisieren()
+
+    def action_gasse_umbenennen(self):
+        if self._gasse_name is None:
+            return
+        name, ok = QInputDialog.getText(self, "Gasse umbenennen", "Name:", text=self._gasse_name)
+        name = name.strip()
+        if not ok or not name or name == self._gasse_name:
+            return
+        if name in self.lager.gassen:
+            QMessageBox.warning(self, "Fehler", f"„{name}“ existiert bereits.")
+            return
+        self.lager.rename_gasse(self._gasse_name, name)
+        self._gasse_name = name
+        self._gassen_liste_aktualisieren()
+
+    def action_gasse_loeschen(self):
+        if self._gasse_name is None:
+            return
+        if QMessageBox.question(self, "Gasse entfernen", f"„{self._gasse_name}“ entfernen?") != QMessageBox.Yes:
+            return
+        self.lager.remove_gasse(self._gasse_name)
+        self._gasse_name = next(iter(self.lager.gassen), None)
+        self._gassen_liste_aktualisieren()
+        if self._gasse_name is not None:
+            self._gasse_in_formular(self.lager.gassen[self._gasse_name])
+        else:
+            self._formular_leeren()
 
 # ---------------------------------------------------------
 # Run
@@ -0,0 +1,137 @@
+import math
+
+import pytest
+
+import lagermodell
+from lagermodell import Gasse, Lager, fahrzeit, berechne_gasse
+
+BASIS = dict(
+    verfahrweg=100, gassenhoehe=30,
+    geschw_vx=4, beschl_ax=1, verschliff_x=0.5,
+    geschw_vy=3, beschl_ay=0.5, verschliff_y=0.5,
+    vorzone_einlagern=4, vorzone_auslagern=6,
+    platz1=8, platz2=10, verschliff_lam=1, umlagerungen_anteil=20,
+)
+
+def gasse(**abw) -> Gasse:
+    return Gasse.from_dict({**BASIS, **abw})
+
+@pytest.fixture
+def zaehler(monkeypatch):
+    aufrufe = []
+    original = lagermodell.berechne_gasse
+    def zaehlend(g):
+        aufrufe.append(g)
+        return original(g)
+    monkeypatch.setattr(lagermodell, "berechne_gasse", zaehlend)
+    return aufrufe
+
+# ---------------------------------------------------------
+# Spielzeit
+# ---------------------------------------------------------
+def test_fahrzeit_trapez_und_dreieck():
+    # v²/a = 16 m: 20 m -> Trapez, 6 m bei v²/a = 18 m -> Dreieck
+    assert fahrzeit(20, 4, 1) == pytest.approx(20 / 4 + 4 / 1)
+    assert fahrzeit(6, 3, 0.5) == pytest.approx(2 * math.sqrt(6 / 0.5))
+    assert fahrzeit(0, 3, 0.5) == 0.0
+
+def test_spielzeit_von_hand():
+    # P1 = (20, 20), P2 = (66.67, 6), P1->P2 = (46.67, 14)
+    t_p1 = max(20 / 4 + 4, 20 / 3 + 6) + 0.5                        # y maßgebend (Trapez)
+    t_p2 = max((200 / 3) / 4 + 4, 2 * math.sqrt(6 / 0.5)) + 0.5    # x maßgebend, y Dreieck
+    t_p1p2 = max((140 / 3) / 4 + 4, 2 * math.sqrt(14 / 0.5)) + 0.5
+    t_vorzone = (4 + 6) / 2 + 1
+    t_platz = 8 + 0.2 * 10 + 1
+
+    r = berechne_gasse(gasse())
+    assert r["t_es"] == pytest.approx(t_p1 + t_p2 + t_vorzone + t_platz)
+    assert r["t_ds"] == pytest.approx(t_p1 + t_p2 + t_p1p2 + 2 * t_vorzone + 2 * t_platz)
+    assert r["durchsatz_ds"] == pytest.approx(7200 / r["t_ds"])
+
+# ---------------------------------------------------------
+# Validierung
+# ---------------------------------------------------------
+@pytest.mark.parametrize("feld, wert", [
+    ("geschw_vx", 0), ("beschl_ay", -1), ("verfahrweg", -10),
+    ("platz1", "nan"), ("gassenhoehe", "inf"), ("umlagerungen_anteil", 101),
+    ("platz2", "abc"), ("verschliff_lam", ""),
+])
+def test_ungueltige_werte(feld, wert):
+    with pytest.raises(ValueError, match=feld):
+        gasse(**{feld: wert})
+
+def test_fehlender_wert():
+    daten = dict(BASIS); del daten["platz1"]
+    with pytest.raises(ValueError, match="platz1"):
+        Gasse.from_dict(daten)
+
+# ---------------------------------------------------------
+# Lager
+# ---------------------------------------------------------
+def test_gleiche_gassen_nur_einmal(zaehler):
+    lager = Lager({f"G{i}": gasse(geraet="RBG 2 Mast" if i % 2 else "RBG 1 Mast") for i in range(10)})
+    ergebnisse = lager.berechnen()
+    assert len(zaehler) == 1
+    assert len(ergebnisse) == 10
+
+def test_nur_geaenderte_gasse_neu(zaehler):
+    lager = Lager({"G1": gasse(), "G2": gasse(verfahrweg=120), "G3": gasse(verfahrweg=140)})
+    lager.berechnen()
+    zaehler.clear()
+
+    lager.set_gasse("G2", gasse(verfahrweg=300))
+    ergebnisse = lager.berechnen()
+    assert zaehler == [gasse(verfahrweg=300)]
+    assert ergebnisse["G2"] == berechne_gasse(gasse(verfahrweg=300))
+
+def test_unveraendertes_lager_rechnet_nichts(zaehler):
+    lager = Lager({"G1": gasse(), "G2": gasse(verfahrweg=120)})
+    erstes = lager.berechnen()
+    zaehler.clear()
+    assert lager.berechnen() == erstes
+    assert zaehler == []
+
+def test_umbenennen_behaelt_cache(zaehler):
+    lager = Lager({"G1": gasse(), "G2": gasse(verfahrweg=120)})
+    vorher = lager.berechnen()
+    zaehler.clear()
+
+    lager.rename_gasse("G1", "Gasse A")
+    ergebnisse = lager.berechnen()
+    assert zaehler == []
+    assert list(ergebnisse) == ["Gasse A", "G2"]
+    assert ergebnisse["Gasse A"] == vorher["G1"]
+
+def test_entfernen_raeumt_cache_auf(zaehler):
+    lager = Lager({"G1": gasse(), "G2": gasse(verfahrweg=120), "G3": gasse(verfahrweg=120)})
+    lager.berechnen()
+
+    lager.remove_gasse("G2")       # Konfiguration wird von G3 weiter genutzt
+    lager.berechnen()
+    assert set(lager._cache) == {gasse(), gasse(verfahrweg=120)}
+
+    lager.remove_gasse("G3")
+    zaehler.clear()
+    assert list(lager.berechnen()) == ["G1"]
+    assert zaehler == []
+    assert set(lager._cache) == {gasse()}
+
+def test_dict_rundreise():
+    lager = Lager({"Gasse 1": gasse(), "Gasse 2": gasse(verfahrweg=80, geraet="RBG 2 Mast")})
+    kopie = Lager.from_dict(lager.to_dict())
+    assert kopie.to_dict() == lager.to_dict()
+    assert list(kopie.gassen) == ["Gasse 1", "Gasse 2"]
+
+def test_kennzahlen():
+    lager = Lager({"kurz": gasse(verfahrweg=50), "lang": gasse(verfahrweg=150)})
+    kpi = lager.kennzahlen()
+    r = lager.berechnen()
+    assert kpi["anzahl_gassen"] == 2
+    assert kpi["durchsatz_ds"] == pytest.approx(r["kurz"]["durchsatz_ds"] + r["lang"]["durchsatz_ds"])
+    assert kpi["engpass"] == "lang"
+
+def test_kennzahlen_leeres_lager():
+    kpi = Lager().kennzahlen()
+    assert kpi["anzahl_gassen"] == 0
+    assert kpi["durchsatz_ds"] == 0.0
+    assert kpi["engpass"] is None